@@ -4,27 +4,106 @@ This module consumes parsed clangd symbol data and function span data
 to produce a function-level call graph.
 """
 
-import yaml
-import re
 from typing import Dict, List, Tuple, Optional, Any
 import logging
-import gc
 import os
 import argparse
-import json
+from json.encoder import encode_basestring_ascii
 import math
+import bisect
+import operator
 from tqdm import tqdm
 
+# Optional imports for the vectorized and JIT-compiled call site lookups
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Optional import for writing the .cql parameter blocks
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import input_params
 from compilation_manager import CompilationManager
 from clangd_index_yaml_parser import (
-    SymbolParser, Symbol, Location, Reference, FunctionSpan, RelativeLocation, CallRelation
+    SymbolParser, Symbol, Location, Reference, FunctionSpan, CallRelation,
+    CALL_REF_KINDS, LEGACY_CALL_REF_KINDS
 )
 from neo4j_manager import Neo4jManager
+from memory_debugger import gc_paused
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+CALL_RELATION_INGEST_QUERY = """
+        UNWIND $relations as relation
+        MATCH (caller:FUNCTION {id: relation.caller_id})
+        MATCH (callee:FUNCTION {id: relation.callee_id})
+        MERGE (caller)-[:CALLS]->(callee)
+        """
+# One relation of the compact .cql PARAMS line, used when orjson is not installed.
+_CQL_RELATION_ROW = '{"caller_id":%s,"callee_id":%s}'
+
+def _unique_call_pairs(call_relations: List[CallRelation]) -> List[Tuple[str, str]]:
+    """
+    Returns the distinct (caller_id, callee_id) pairs in first-seen order. A function
+    calling another from several sites still yields a single :CALLS relationship, so
+    the repeats are dropped before they are sent or written.
+    """
+    return list(dict.fromkeys(zip(map(operator.attrgetter('caller_id'), call_relations),
+                                  map(operator.attrgetter('callee_id'), call_relations))))
+
+# (start_line, start_column, end_line, end_column) of a Location
+_LOCATION_POSITION = operator.itemgetter(1, 2, 3, 4)
+
+def _previous_later_ending(body_ends: List[int]) -> List[int]:
+    """
+    For bodies sorted by start, returns for each body the index of the nearest earlier
+    body that ends after it, or -1. For properly nested bodies this is the enclosing one.
+    Every body between a body and that index ends no later than the body itself, so a
+    containment walk can jump straight to it.
+    """
+    parents = []
+    stack: List[int] = []
+    for i, end in enumerate(body_ends):
+        while stack and body_ends[stack[-1]] <= end:
+            stack.pop()
+        parents.append(stack[-1] if stack else -1)
+        stack.append(i)
+    return parents
+
+# --- JIT Containment Kernel ---
+if numba is not None:
+    @numba.njit(cache=True, parallel=True)
+    def _find_innermost_bodies(call_files, call_starts, call_ends, body_offsets, body_starts, body_ends, body_parents, out_body_idx):
+        """
+        For each call site, writes the index of the innermost body containing it, or -1.
+        Bodies of file f occupy body_offsets[f]:body_offsets[f + 1], sorted by start;
+        body_parents holds each body's nearest earlier body with a later end, or -1.
+        """
+        for i in numba.prange(call_starts.shape[0]):
+            lo = body_offsets[call_files[i]]
+            hi = body_offsets[call_files[i] + 1]
+            call_end = call_ends[i]
+            j = lo + np.searchsorted(body_starts[lo:hi], call_starts[i], side='right') - 1
+            if j < lo:
+                j = -1
+            found = -1
+            while j >= 0:
+                if body_ends[j] >= call_end:
+                    found = j
+                    break
+                j = body_parents[j]
+            out_body_idx[i] = found
+
 # --- Base Extractor Class ---
 class BaseClangdCallGraphExtractor:
     def __init__(self, symbol_parser: SymbolParser, log_batch_size: int = 1000, ingest_batch_size: int = 1000):
@@ -36,35 +115,31 @@ class BaseClangdCallGraphExtractor:
         """Generates a single, parameterized Cypher query for ingesting all call relations."""
         if not call_relations:
             return ("", {})
-        query = """
-        UNWIND $relations as relation
-        MATCH (caller:FUNCTION {id: relation.caller_id})
-        MATCH (callee:FUNCTION {id: relation.callee_id})
-        MERGE (caller)-[:CALLS]->(callee)
-        """
         params = {
             "relations": [
-                {"caller_id": r.caller_id, "callee_id": r.callee_id} for r in call_relations
+                {"caller_id": caller_id, "callee_id": callee_id}
+                for caller_id, callee_id in _unique_call_pairs(call_relations)
             ]
         }
-        return (query, params)
+        return (CALL_RELATION_INGEST_QUERY, params)
     
     def generate_statistics(self, call_relations: List[CallRelation]) -> str:
         """Generate statistics about the extracted call graph."""
-        functions_in_graph = set()
+        # Functions are counted by id: names are longer to hash, and distinct functions can
+        # share a name (e.g. static functions in different files).
         callers = set()
         callees = set()
         recursive_calls = 0
         
         for relation in call_relations:
-            functions_in_graph.add(relation.caller_name)
-            functions_in_graph.add(relation.callee_name)
-            callers.add(relation.caller_name)
-            callees.add(relation.callee_name)
+            callers.add(relation.caller_id)
+            callees.add(relation.callee_id)
             if relation.caller_id == relation.callee_id:
                 recursive_calls += 1
         
-        functions_with_bodies = len([f for f in self.symbol_parser.functions.values() if f.body_location])
+        # Every function in the graph is a caller or a callee, so no third set is needed.
+        functions_in_graph = callers | callees
+        functions_with_bodies = sum(1 for f in self.symbol_parser.functions.values() if f.body_location)
         
         stats = f"""
 Call Graph Statistics:
@@ -89,30 +164,58 @@ Functions that are only called (leaf functions): {len(callees - callers)}
             logger.info("No call relations to ingest.")
             return
 
-        total_relations = len(call_relations)
-        logger.info(f"Preparing {total_relations} call relationships for batched ingestion (1 batch = {self.ingest_batch_size} relationships)...")
+        # MERGE would collapse repeated pairs on the server anyway; dropping them here
+        # shrinks the payload and the number of relationship locks taken.
+        call_pairs = _unique_call_pairs(call_relations)
+        total_relations = len(call_pairs)
+        logger.info(f"Preparing {total_relations} unique call relationships (from {len(call_relations)} call sites) "
+                    f"for batched ingestion (1 batch = {self.ingest_batch_size} relationships)...")
 
         output_file_path = "generated_call_graph_cypher_queries.cql"
-        file_mode = 'w'
+        # Opened once for the whole run rather than once per batch.
+        output_file = None if neo4j_mgr else open(output_file_path, 'w', encoding='utf-8')
         
         total_rels_created = 0
 
-        for i in tqdm(range(0, total_relations, self.ingest_batch_size), desc="Ingesting CALLS relations"):
-            batch = call_relations[i:i + self.ingest_batch_size]
-            query_template, params = self.get_call_relation_ingest_query(batch)
-
-            if neo4j_mgr:
-                all_counters = neo4j_mgr.process_batch([(query_template, params)])
-                for counters in all_counters:
-                    total_rels_created += counters.relationships_created
-            else:
-                formatted_query = query_template.strip()
-                formatted_params = json.dumps(params, indent=2)
-                with open(output_file_path, file_mode) as f:
-                    f.write(f"// Batch {i // self.ingest_batch_size + 1} \n")
-                    f.write(f"{formatted_query};\n")
-                    f.write(f"// PARAMS: {formatted_params}\n")
-                file_mode = 'a'
+        try:
+            for i in tqdm(range(0, total_relations, self.ingest_batch_size), desc="Ingesting CALLS relations"):
+                batch = call_pairs[i:i + self.ingest_batch_size]
+
+                if neo4j_mgr:
+                    params = {"relations": [{"caller_id": caller_id, "callee_id": callee_id} for caller_id, callee_id in batch]}
+                    all_counters = neo4j_mgr.process_batch([(CALL_RELATION_INGEST_QUERY, params)])
+                    for counters in all_counters:
+                        total_rels_created += counters.relationships_created
+                else:
+                    output_file.write(
+                        f"// Batch {i // self.ingest_batch_size + 1} \n"
+                        f"{CALL_RELATION_INGEST_QUERY.strip()};\n"
+                        f"// PARAMS: "
+                    )
+                    # The parameters are written as compact JSON on the PARAMS comment line.
+                    # json.dump with indent runs the pure-Python encoder; orjson, or else
+                    # joining rows escaped by the C string encoder, is several times faster.
+                    # orjson writes non-ASCII text raw, so its output is only used when it is
+                    # pure ASCII; otherwise the escaped rows keep the file independent of
+                    # whether orjson is installed.
+                    params_json = None
+                    if orjson is not None:
+                        params_json = orjson.dumps({"relations": [
+                            {"caller_id": caller_id, "callee_id": callee_id} for caller_id, callee_id in batch
+                        ]})
+                    if params_json is not None and params_json.isascii():
+                        output_file.write(params_json.decode())
+                    else:
+                        output_file.write('{"relations":[')
+                        output_file.write(",".join([
+                            _CQL_RELATION_ROW % (encode_basestring_ascii(caller_id), encode_basestring_ascii(callee_id))
+                            for caller_id, callee_id in batch
+                        ]))
+                        output_file.write(']}')
+                    output_file.write('\n')
+        finally:
+            if output_file:
+                output_file.close()
 
         logger.info(f"Finished processing {total_relations} call relationships in batches.")
         if neo4j_mgr:
@@ -125,103 +228,252 @@ class ClangdCallGraphExtractorWithoutContainer(BaseClangdCallGraphExtractor):
     def __init__(self, symbol_parser: SymbolParser, log_batch_size: int = 1000, ingest_batch_size: int = 1000):
         super().__init__(symbol_parser, log_batch_size, ingest_batch_size)
 
-    def _is_location_within_function_body(self, call_loc: Location, body_loc: RelativeLocation, body_file_uri: str) -> bool:
-        if call_loc.file_uri != body_file_uri:
-            return False
-        
-        start_ok = (call_loc.start_line > body_loc.start_line) or \
-                   (call_loc.start_line == body_loc.start_line and call_loc.start_column >= body_loc.start_column)
-        
-        end_ok = (call_loc.end_line < body_loc.end_line) or \
-                 (call_loc.end_line == body_loc.end_line and call_loc.end_column <= body_loc.end_column)
-        
-        return start_ok and end_ok
+    def _find_containing_function(self, call_loc: Location, body_index: Tuple[List[int], List[int], List[int], List[Symbol]]) -> Optional[Symbol]:
+        """
+        Returns the innermost function whose body contains the call location, or None.
+
+        Bodies are sorted by packed start position, so bisect gives the last body that
+        starts at or before the call. If that body ends before the call does, the walk
+        jumps to its parent, the nearest earlier body ending later; the bodies skipped in
+        between end even earlier. The walk is bounded by the nesting depth and usually
+        the first candidate already contains the call.
+        """
+        body_starts, body_ends, body_parents, callers = body_index
+        call_end = (call_loc.end_line << 32) | call_loc.end_column
+        i = bisect.bisect_right(body_starts, (call_loc.start_line << 32) | call_loc.start_column) - 1
+        while i >= 0:
+            if body_ends[i] >= call_end:
+                return callers[i]
+            i = body_parents[i]
+        return None
+
+    def _extract_with_bisect_lookup(self, file_to_body_interval_index: Dict, valid_call_kinds: frozenset) -> List[CallRelation]:
+        """Resolves the caller of each call site one reference at a time."""
+        call_relations = []
+        seen_call_sites = set()
+        for callee_symbol in self.symbol_parser.functions.values():
+            for reference in callee_symbol.references:
+                if reference.kind not in valid_call_kinds:
+                    continue
+                
+                call_location = reference.location
+                body_index = file_to_body_interval_index.get(call_location.file_uri)
+                if body_index is None:
+                    continue
+
+                # The same call site can be listed more than once (e.g. a header seen from several TUs).
+                call_site_key = (callee_symbol.id, call_location)
+                if call_site_key in seen_call_sites:
+                    continue
+                seen_call_sites.add(call_site_key)
+
+                caller_symbol = self._find_containing_function(call_location, body_index)
+                if caller_symbol:
+                    call_relations.append(CallRelation(
+                        caller_symbol.id, caller_symbol.name,
+                        callee_symbol.id, callee_symbol.name,
+                        call_location
+                    ))
+        return call_relations
+
+    def _match_call_sites_numpy(self, candidates: "np.ndarray", call_ends: "np.ndarray", body_ends: "np.ndarray",
+                                body_parents: "np.ndarray") -> "np.ndarray":
+        """
+        Returns the innermost containing body index for each call site, or -1.
+
+        candidates holds, per call site, the last body starting at or before it (or -1).
+        All sites whose candidate ends too early jump to the candidate's parent together,
+        so the loop runs once per nesting level rather than once per call site.
+        """
+        body_idx_per_site = np.full(len(candidates), -1, dtype=np.int64)
+        active = np.flatnonzero(candidates >= 0)
+        bodies = candidates[active]
+        while len(active):
+            contains = body_ends[bodies] >= call_ends[active]
+            body_idx_per_site[active[contains]] = bodies[contains]
+            active, bodies = active[~contains], body_parents[bodies[~contains]]
+            has_parent = bodies >= 0
+            active, bodies = active[has_parent], bodies[has_parent]
+        return body_idx_per_site
+
+    def _extract_with_vectorized_lookup(self, file_to_body_interval_index: Dict, valid_call_kinds: frozenset) -> List[CallRelation]:
+        """
+        Resolves callers over Structure-of-Arrays columns: each call site is recorded as
+        an int file id plus packed (line << 32 | column) start and end positions, and the
+        body intervals of all files are concatenated into flat arrays with per-file
+        offsets. The Numba kernel resolves every call site in one launch; without Numba
+        the same arrays are matched file by file with plain NumPy.
+        """
+        # File ids are positions in the flattened body arrays.
+        file_ids: Dict[str, int] = {}
+        body_starts, body_ends, body_parents, callers = [], [], [], []
+        body_offsets = [0]
+        for file_id, (file_uri, (file_starts, file_ends, file_parents, file_callers)) in enumerate(file_to_body_interval_index.items()):
+            file_ids[file_uri] = file_id
+            file_offset = len(body_starts)
+            body_starts.extend(file_starts)
+            body_ends.extend(file_ends)
+            body_parents.extend(parent + file_offset if parent >= 0 else -1 for parent in file_parents)
+            callers.extend(file_callers)
+            body_offsets.append(len(body_starts))
+
+        # Only the Location and the callee/file indexes are collected per reference; the
+        # positions are unpacked by C-level itemgetter calls and packed with array ops.
+        functions = list(self.symbol_parser.functions.values())
+        call_locations: List[Location] = []
+        call_callees, call_files = [], []
+        for callee_idx, callee_symbol in enumerate(functions):
+            for reference in callee_symbol.references:
+                if reference.kind in valid_call_kinds:
+                    file_id = file_ids.get(reference.location.file_uri)
+                    if file_id is not None:
+                        call_locations.append(reference.location)
+                        call_callees.append(callee_idx)
+                        call_files.append(file_id)
+        del file_ids
+
+        positions = np.array(list(map(_LOCATION_POSITION, call_locations)), dtype=np.int64).reshape(len(call_locations), 4)
+        call_starts = (positions[:, 0] << 32) | positions[:, 1]
+        call_ends = (positions[:, 2] << 32) | positions[:, 3]
+        del positions
+        call_callees = np.array(call_callees, dtype=np.int64)
+        call_files = np.array(call_files, dtype=np.int64)
+
+        # The same call site can be listed more than once (e.g. a header seen from several TUs).
+        # Sort by (callee, file, start, end) and keep the first site of each run of equal keys.
+        order = np.lexsort((call_ends, call_starts, call_files, call_callees))
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = False
+        for column in (call_callees, call_files, call_starts, call_ends):
+            sorted_column = column[order]
+            is_first[1:] |= sorted_column[1:] != sorted_column[:-1]
+        site_indexes = np.sort(order[is_first])
+        call_files = call_files[site_indexes]
+        call_starts = call_starts[site_indexes]
+        call_ends = call_ends[site_indexes]
+
+        body_offsets = np.array(body_offsets, dtype=np.int64)
+        body_starts = np.array(body_starts, dtype=np.int64)
+        body_ends = np.array(body_ends, dtype=np.int64)
+        body_parents = np.array(body_parents, dtype=np.int64)
+
+        if numba is not None:
+            body_idx_per_site = np.empty(len(site_indexes), dtype=np.int64)
+            _find_innermost_bodies(call_files, call_starts, call_ends, body_offsets,
+                                   body_starts, body_ends, body_parents, body_idx_per_site)
+        else:
+            # Find each site's candidate body with one searchsorted per file, grouping the
+            # call sites by file with a stable sort, then resolve all sites together.
+            candidates = np.full(len(site_indexes), -1, dtype=np.int64)
+            order = np.argsort(call_files, kind='stable')
+            run_bounds = np.flatnonzero(np.diff(call_files[order])) + 1
+            for run in np.split(order, run_bounds):
+                if not len(run):
+                    continue
+                file_id = call_files[run[0]]
+                b0, b1 = body_offsets[file_id], body_offsets[file_id + 1]
+                file_candidates = np.searchsorted(body_starts[b0:b1], call_starts[run], side='right') - 1
+                candidates[run] = np.where(file_candidates >= 0, file_candidates + b0, -1)
+            body_idx_per_site = self._match_call_sites_numpy(candidates, call_ends, body_ends, body_parents)
+
+        matched = np.flatnonzero(body_idx_per_site >= 0)
+        matched_sites = site_indexes[matched]
+        call_relations = []
+        for site, callee_idx, body_idx in zip(matched_sites.tolist(), call_callees[matched_sites].tolist(),
+                                              body_idx_per_site[matched].tolist()):
+            callee_symbol = functions[callee_idx]
+            caller_symbol = callers[body_idx]
+            call_relations.append(CallRelation(
+                caller_symbol.id, caller_symbol.name,
+                callee_symbol.id, callee_symbol.name,
+                call_locations[site]
+            ))
+        return call_relations
 
+    @gc_paused()
     def extract_call_relationships(self) -> List[CallRelation]:
         """Extract function call relationships from the parsed data using spatial indexing."""
         call_relations = []
-        functions_with_bodies = {fid: f for fid, f in self.symbol_parser.functions.items() if f.body_location}
-        
-        if not functions_with_bodies:
-            logger.warning("No functions have body locations. Did you load function spans?")
-            return call_relations
-        
-        logger.info(f"Analyzing calls for {len(functions_with_bodies)} functions with body spans using optimized lookup")
 
-        file_to_function_bodies_index: Dict[str, List[Tuple[RelativeLocation, Symbol]]] = {}
-        for caller_symbol in functions_with_bodies.values():
-            if caller_symbol.body_location and caller_symbol.definition:
+        # Bucket the callers by the file that holds their body, so each call site is only
+        # ever compared against the functions defined in its own file. Body positions are
+        # packed as (line << 32 | column) so that comparing two positions is a single int
+        # comparison: (body start, body end, caller)
+        file_to_function_bodies_index: Dict[str, List[Tuple[int, int, Symbol]]] = {}
+        num_functions_with_bodies = 0
+        for caller_symbol in self.symbol_parser.functions.values():
+            body_loc = caller_symbol.body_location
+            if not body_loc:
+                continue
+            num_functions_with_bodies += 1
+            if caller_symbol.definition:
                 file_uri = caller_symbol.definition.file_uri
-                file_to_function_bodies_index.setdefault(file_uri, []).append((caller_symbol.body_location, caller_symbol))
+                file_to_function_bodies_index.setdefault(file_uri, []).append((
+                    (body_loc.start_line << 32) | body_loc.start_column,
+                    (body_loc.end_line << 32) | body_loc.end_column,
+                    caller_symbol
+                ))
 
-        for file_uri in file_to_function_bodies_index:
-            file_to_function_bodies_index[file_uri].sort(key=lambda item: item[0].start_line)
-        logger.info(f"Built spatial index for {len(file_to_function_bodies_index)} files.")
-        del functions_with_bodies
-        gc.collect()
+        if not num_functions_with_bodies:
+            logger.warning("No functions have body locations. Did you load function spans?")
+            return call_relations
+        
+        logger.info(f"Analyzing calls for {num_functions_with_bodies} functions with body spans using optimized lookup")
+
+        # Per file: (sorted body starts, body ends, parent body indexes, callers)
+        file_to_body_interval_index: Dict[str, Tuple[List[int], List[int], List[int], List[Symbol]]] = {}
+        for file_uri, bodies in file_to_function_bodies_index.items():
+            bodies.sort(key=operator.itemgetter(0))
+            body_starts = [start for start, _, _ in bodies]
+            body_ends = [end for _, end, _ in bodies]
+            file_to_body_interval_index[file_uri] = (body_starts, body_ends, _previous_later_ending(body_ends),
+                                                     [caller for _, _, caller in bodies])
+        logger.info(f"Built spatial index for {len(file_to_body_interval_index)} files.")
+        del file_to_function_bodies_index
 
         # Determine the correct call kinds to look for based on the clangd version.
-        if self.symbol_parser.has_call_kind:
-            # Kind 20: Call | Reference
-            # Kind 28: Call | Reference | Spelled
-            valid_call_kinds = [20, 28]
-        else:
-            # Kind 4: Reference
-            # Kind 12: Reference | Spelled
-            valid_call_kinds = [4, 12]
-        
-        logger.info(f"Using call kinds for detection: {valid_call_kinds}")
+        valid_call_kinds = CALL_REF_KINDS if self.symbol_parser.has_call_kind else LEGACY_CALL_REF_KINDS
+        logger.info(f"Using call kinds for detection: {sorted(valid_call_kinds)}")
 
         logger.info("Processing call relationships for callees...")
-        for callee_symbol in self.symbol_parser.symbols.values():
-            if not callee_symbol.references or not callee_symbol.is_function():
-                continue
-            
-            for reference in callee_symbol.references:
-                if reference.kind not in valid_call_kinds:
-                    continue
-                
-                call_location = reference.location
-                if call_location.file_uri in file_to_function_bodies_index:
-                    for body_loc, caller_symbol in file_to_function_bodies_index[call_location.file_uri]:
-                        if self._is_location_within_function_body(call_location, body_loc, call_location.file_uri):
-                            call_relations.append(CallRelation(
-                                caller_id=caller_symbol.id,
-                                caller_name=caller_symbol.name,
-                                callee_id=callee_symbol.id,
-                                callee_name=callee_symbol.name,
-                                call_location=call_location
-                            ))
-                            break
+        if np is not None:
+            call_relations = self._extract_with_vectorized_lookup(file_to_body_interval_index, valid_call_kinds)
+        else:
+            call_relations = self._extract_with_bisect_lookup(file_to_body_interval_index, valid_call_kinds)
 
         logger.info(f"Extracted {len(call_relations)} call relationships")
-        del file_to_function_bodies_index
-        gc.collect()
+        del file_to_body_interval_index
 
         return call_relations
     
 class ClangdCallGraphExtractorWithContainer(BaseClangdCallGraphExtractor):
+    @gc_paused()
     def extract_call_relationships(self) -> List[CallRelation]:
         call_relations = []
+        seen_call_sites = set()
         logger.info("Extracting call relationships using Container field...")
 
-        for callee_symbol in self.symbol_parser.symbols.values():
-            if not callee_symbol.references or not callee_symbol.is_function():
-                continue
-            
+        # The parser only keeps references inside a container, and both ends of a call
+        # must be functions, so the functions table is all that needs to be scanned.
+        functions = self.symbol_parser.functions
+        for callee_symbol in functions.values():
             for reference in callee_symbol.references:
-                if reference.container_id and reference.container_id != '0000000000000000' and reference.kind in [20, 28]:
-                    caller_id = reference.container_id
-                    caller_symbol = self.symbol_parser.symbols.get(caller_id)
-                    
-                    if caller_symbol and caller_symbol.is_function():
-                        call_relations.append(CallRelation(
-                            caller_id=caller_symbol.id,
-                            caller_name=caller_symbol.name,
-                            callee_id=callee_symbol.id,
-                            callee_name=callee_symbol.name,
-                            call_location=reference.location
-                        ))
+                if reference.kind not in CALL_REF_KINDS:
+                    continue
+                caller_symbol = functions.get(reference.container_id)
+                if caller_symbol is None:
+                    continue
+
+                # The same call site can be listed more than once (e.g. a header seen from several TUs).
+                call_site_key = (caller_symbol.id, callee_symbol.id, reference.location)
+                if call_site_key in seen_call_sites:
+                    continue
+                seen_call_sites.add(call_site_key)
+                call_relations.append(CallRelation(
+                    caller_symbol.id, caller_symbol.name,
+                    callee_symbol.id, callee_symbol.name,
+                    reference.location
+                ))
         
         logger.info(f"Extracted {len(call_relations)} call relationships")
         return call_relations
@@ -256,21 +508,26 @@ def main():
     symbol_parser.parse(num_workers=args.num_parse_workers)
     logger.info("--- Finished Phase 0 ---")
 
-    # --- NEW: Phase 1: Parse Source Code (for spans) ---
-    logger.info("\n--- Starting Phase 1: Parsing Source Code for Spans ---")
-    compilation_manager = CompilationManager(
-        parser_type=args.source_parser,
-        project_path=args.project_path,
-        compile_commands_path=args.compile_commands
-    )
-    compilation_manager.parse_folder(args.project_path)
-    logger.info("--- Finished Phase 1 ---")
-
-    # --- NEW: Phase 2: Create FunctionSpanProvider adapter ---
-    from function_span_provider import FunctionSpanProvider
-    logger.info("\n--- Starting Phase 2: Enriching Symbols with Spans ---")
-    FunctionSpanProvider(symbol_parser=symbol_parser, compilation_manager=compilation_manager)
-    logger.info("--- Finished Phase 2 ---")
+    # --- Phase 1 & 2: Parse source code for spans and enrich symbols ---
+    # Only the extractor without the Container field needs function bodies, so the
+    # source parse is skipped entirely when the index already records call containers.
+    if symbol_parser.has_container_field:
+        logger.info("\nIndex has the Container field; skipping source parsing for function spans.")
+    else:
+        logger.info("\n--- Starting Phase 1: Parsing Source Code for Spans ---")
+        compilation_manager = CompilationManager(
+            parser_type=args.source_parser,
+            project_path=args.project_path,
+            compile_commands_path=args.compile_commands
+        )
+        compilation_manager.parse_folder(args.project_path, args.num_parse_workers)
+        logger.info("--- Finished Phase 1 ---")
+
+        from function_span_provider import FunctionSpanProvider
+        logger.info("\n--- Starting Phase 2: Enriching Symbols with Spans ---")
+        FunctionSpanProvider(symbol_parser=symbol_parser, compilation_manager=compilation_manager).enrich_symbols_with_span()
+        del compilation_manager
+        logger.info("--- Finished Phase 2 ---")
 
     # --- Phase 3: Create extractor based on available features ---
     logger.info("\n--- Starting Phase 3: Creating Call Graph Extractor ---")
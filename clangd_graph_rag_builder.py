@@ -106,7 +106,6 @@ class GraphBuilder:
         
         logger.info(f"Enriched {span_provider.get_matched_count()} symbols with body_location.")
         del span_provider
-        gc.collect()
         logger.info("--- Finished Pass 2 ---")
 
     def _setup_database(self, neo4j_mgr):
@@ -128,7 +127,6 @@ class GraphBuilder:
         # Pass both symbol_parser and compilation_manager to the updated ingest_paths
         path_processor.ingest_paths(self.symbol_parser.symbols, self.compilation_manager)
         del path_processor, path_manager
-        gc.collect()
         logger.info("--- Finished Pass 3 ---")
 
     def _pass_4_ingest_symbols(self, neo4j_mgr):
@@ -144,7 +142,6 @@ class GraphBuilder:
         # property from the enriched symbol objects.
         symbol_processor.ingest_symbols_and_relationships(self.symbol_parser.symbols, neo4j_mgr, self.args.defines_generation)
         del symbol_processor, path_manager
-        gc.collect()
         logger.info("--- Finished Pass 4 ---")
 
     def _pass_5_ingest_includes(self, neo4j_mgr):
@@ -152,7 +149,6 @@ class GraphBuilder:
         include_provider = IncludeRelationProvider(neo4j_mgr, self.args.project_path)
         include_provider.ingest_include_relations(self.compilation_manager)
         del include_provider
-        gc.collect()
         logger.info("--- Finished Pass 5 ---")
 
     def _pass_6_ingest_call_graph(self, neo4j_mgr):
@@ -170,7 +166,6 @@ class GraphBuilder:
         call_relations = extractor.extract_call_relationships()
         extractor.ingest_call_relations(call_relations, neo4j_mgr=neo4j_mgr)
         del extractor, call_relations
-        gc.collect()
         logger.info("--- Finished Pass 6 ---")
 
     def _pass_7_generate_rag(self, neo4j_mgr):
@@ -8,27 +8,115 @@ in-memory collection of symbol objects.
 """
 
 import yaml, pickle
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional, Iterator, Union
 from dataclasses import dataclass
-import logging, os
-import gc
-import math
+import logging, os, sys
 import concurrent.futures
+import mmap
 import itertools
-from memory_debugger import Debugger # Import Debugger
+from memory_debugger import Debugger, gc_paused
 
 logger = logging.getLogger(__name__)
 
-# --- YAML tag handling ---
-def unknown_tag(loader, tag_suffix, node):
-    return loader.construct_mapping(node)
+# --- YAML loading ---
+# Prefer the libyaml-backed loader, which is several times faster than the
+# pure-Python SafeLoader on large index files.
+try:
+    from yaml import CSafeLoader as _BaseYamlLoader
+except ImportError:
+    from yaml import SafeLoader as _BaseYamlLoader
+    logger.warning("PyYAML was built without libyaml; falling back to the slow pure-Python SafeLoader.")
 
-yaml.SafeLoader.add_multi_constructor("!", unknown_tag)
+class _YamlLoader(_BaseYamlLoader):
+    """
+    Loader specialised for the clangd index schema, which only contains nested
+    mappings and sequences of scalars. load_documents() builds every document
+    straight from the parser's event stream into plain dicts and lists, skipping the
+    node graph that the regular compose/construct pipeline allocates for each value.
+    Tags on mappings and sequences (e.g. !Symbol, !Refs) are ignored.
+    """
+
+    def load_documents(self) -> Iterator:
+        """Yields each document of the stream as plain dicts, lists and scalars."""
+        stack = []
+        container = None
+        key = _NO_KEY
+        try:
+            while self.check_event():
+                event = self.get_event()
+                event_class = event.__class__
+                if event_class is yaml.ScalarEvent:
+                    value = self._construct_scalar_event(event)
+                elif event_class is yaml.MappingStartEvent or event_class is yaml.SequenceStartEvent:
+                    stack.append((container, key))
+                    container = {} if event_class is yaml.MappingStartEvent else []
+                    key = _NO_KEY
+                    continue
+                elif event_class is yaml.MappingEndEvent or event_class is yaml.SequenceEndEvent:
+                    value = container
+                    container, key = stack.pop()
+                elif event_class is yaml.AliasEvent:
+                    raise yaml.constructor.ConstructorError(None, None, "aliases are not supported in clangd index files", event.start_mark)
+                else:
+                    continue  # Stream and document start/end events
+
+                if container is None:
+                    yield value
+                elif container.__class__ is dict:
+                    if key is _NO_KEY:
+                        key = value
+                    else:
+                        container[key] = value
+                        key = _NO_KEY
+                else:
+                    container.append(value)
+        finally:
+            self.dispose()
+
+    def _construct_scalar_event(self, event):
+        """Resolves a scalar exactly as the regular loader would, with fast paths for the common cases."""
+        value = event.value
+        tag = event.tag
+        if tag is None or tag == '!':
+            if not event.implicit[0]:
+                return value  # Quoted scalars are always strings
+            # Plain decimals are the bulk of an index (lines, columns, kinds).
+            if value.isascii() and value.isdigit() and (value[0] != '0' or len(value) == 1):
+                return int(value)
+            tag = self.resolve(yaml.ScalarNode, value, event.implicit)
+        if tag == 'tag:yaml.org,2002:str':
+            return value
+        constructor = self.yaml_constructors.get(tag, type(self).construct_undefined)
+        return constructor(self, yaml.ScalarNode(tag, value, event.start_mark, event.end_mark, event.style))
+
+# Marks that the next scalar in a mapping is a key rather than a value.
+_NO_KEY = object()
+
+class _TabSanitizingStream:
+    """File-like wrapper that replaces tabs on the fly so the YAML loader can stream the file."""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, size: int = -1):
+        data = self.stream.read(size)
+        return data.replace(b'\t', b'  ') if isinstance(data, bytes) else data.replace('\t', '  ')
+
+# --- Reference Kinds ---
+# RefKind combinations that mark a call site (see docs/clangd-index-yaml-spec.txt).
+# clangd-indexer 21.x+: Kind 20 (Call | Reference) and Kind 28 (Call | Reference | Spelled)
+CALL_REF_KINDS = frozenset({20, 28})
+# Older indexers have no Call bit: Kind 4 (Reference) and Kind 12 (Reference | Spelled)
+LEGACY_CALL_REF_KINDS = frozenset({4, 12})
+ALL_CALL_REF_KINDS = CALL_REF_KINDS | LEGACY_CALL_REF_KINDS
+# Container ID clangd writes for references outside any symbol (e.g. at file scope).
+NULL_CONTAINER_ID = '0000000000000000'
 
 # --- Common Data Classes ---
+# The immutable value records are NamedTuples: no per-instance __dict__, and they
+# pickle as plain tuples, which keeps the cache small and fast to load. Symbol stays
+# a slotted dataclass because its body_location is filled in after parsing.
 
-@dataclass
-class Location:
+class Location(NamedTuple):
     file_uri: str
     start_line: int
     start_column: int
@@ -36,17 +124,18 @@ class Location:
     end_column: int
     
     @classmethod
-    def from_dict(cls, data: dict) -> 'Location':
-        return cls(
-            file_uri=data['FileURI'],
-            start_line=data['Start']['Line'],
-            start_column=data['Start']['Column'],
-            end_line=data['End']['Line'],
-            end_column=data['End']['Column']
-        )
-
-@dataclass
-class RelativeLocation:
+    def from_dict(cls, data: dict, pool: Optional[Dict['Location', 'Location']] = None) -> 'Location':
+        # Interned, so each file's URI is stored once and URI comparisons and
+        # dict lookups keyed by it hit the identity fast path. Built positionally:
+        # this runs for every location in the index, and keyword arguments make the
+        # NamedTuple constructor markedly slower.
+        start = data['Start']
+        end = data['End']
+        location = cls(sys.intern(data['FileURI']), start['Line'], start['Column'], end['Line'], end['Column'])
+        # With a pool, equal locations share the first instance (flyweight).
+        return location if pool is None else pool.setdefault(location, location)
+
+class RelativeLocation(NamedTuple):
     start_line: int
     start_column: int
     end_line: int
@@ -61,7 +150,7 @@ class RelativeLocation:
             end_column=data['End']['Column']
         )
 
-@dataclass
+@dataclass(slots=True)
 class FunctionSpan:
     name: str
     name_location: RelativeLocation
@@ -75,21 +164,18 @@ class FunctionSpan:
             body_location=RelativeLocation.from_dict(data['BodyLocation'])
         )
 
-@dataclass
-class Reference:
+class Reference(NamedTuple):
     kind: int
     location: Location
     container_id: Optional[str] = None
     
     @classmethod
-    def from_dict(cls, data: dict) -> 'Reference':
-        return cls(
-            kind=data['Kind'],
-            location=Location.from_dict(data['Location']),
-            container_id=data.get('Container', {}).get('ID')
-        )
+    def from_dict(cls, data: dict, location_pool: Optional[Dict[Location, Location]] = None) -> 'Reference':
+        container = data.get('Container')
+        return cls(data['Kind'], Location.from_dict(data['Location'], location_pool),
+                   container.get('ID') if container else None)
 
-@dataclass
+@dataclass(slots=True)
 class Symbol:
     id: str
     name: str
@@ -107,8 +193,9 @@ class Symbol:
     def is_function(self) -> bool:
         return self.kind == 'Function'
 
-@dataclass
-class CallRelation:
+# Built positionally on the extraction hot paths: keyword arguments make the
+# NamedTuple constructor markedly slower.
+class CallRelation(NamedTuple):
     caller_id: str
     caller_name: str
     callee_id: str
@@ -116,6 +203,9 @@ class CallRelation:
     call_location: Location
 
 # --- Symbol Parser ---
+# Bump whenever the pickled layout of the data classes changes, so older caches are re-parsed.
+CACHE_FORMAT_VERSION = 4
+
 
 class SymbolParser:
     """A high-performance parser for clangd index YAML files with built-in caching."""
@@ -130,9 +220,15 @@ class SymbolParser:
         self.has_container_field: bool = False
         self.has_call_kind: bool = False
         
-        # This field is transient and only used during YAML parsing
-        self.unlinked_refs: List[Dict] = []
-
+        # These fields are transient and only used during YAML parsing.
+        # Each entry is (symbol ID, list of raw reference dicts) from one !Refs document.
+        self.unlinked_refs: List[Tuple[str, List[Dict]]] = []
+        # Equal locations (e.g. a declaration that is also the definition, or the same
+        # reference reported by several TUs) share one Location object.
+        self._location_pool: Dict[Location, Location] = {}
+        self._num_dropped_refs = 0
+
+    @gc_paused()
     def parse(self, num_workers: int = 1):
         """
         Main entry point for parsing. Handles cache loading/saving.
@@ -143,11 +239,13 @@ class SymbolParser:
         if self.index_file_path.endswith('.pkl'):
             self._load_cache_file(self.index_file_path)
             return # Loading complete
-        elif os.path.exists(cache_path) and os.path.getmtime(cache_path) > os.path.getmtime(self.index_file_path):
-            logger.info(f"Found valid cache file: {cache_path}")
-            logger.info("To force re-parsing the YAML, delete the .pkl file or touch the YAML file and run again.")
-            self._load_cache_file(cache_path)
-            return # Loading complete
+        elif os.path.exists(cache_path):
+            if self._is_cache_current(cache_path):
+                logger.info(f"Found valid cache file: {cache_path}")
+                logger.info("To force re-parsing the YAML, delete the .pkl file or touch the YAML file and run again.")
+                self._load_cache_file(cache_path)
+                return # Loading complete
+            logger.info(f"Cache file {cache_path} is outdated or was written in an older format. Re-parsing the YAML.")
 
         # --- Cache not found or is outdated, proceed with YAML parsing ---
         if num_workers > 1:
@@ -162,10 +260,27 @@ class SymbolParser:
         # --- Save to cache for future runs ---
         self._dump_cache_file(cache_path)
 
+    def _source_stamp(self) -> Tuple[int, int]:
+        """Identifies the current contents of the index file by its size and modification time."""
+        stat = os.stat(self.index_file_path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _is_cache_current(self, cache_path: str) -> bool:
+        """Reads only the header that precedes the cached data: format version and source stamp."""
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f) == CACHE_FORMAT_VERSION and pickle.load(f) == self._source_stamp()
+        except Exception:
+            return False
+
     def _load_cache_file(self, cache_path: str):
         logger.info(f"Loading parsed symbols from cache: {cache_path}")
         try:
             with open(cache_path, 'rb') as f:
+                version = pickle.load(f)
+                if version != CACHE_FORMAT_VERSION:
+                    raise pickle.UnpicklingError(f"unsupported cache format (expected version {CACHE_FORMAT_VERSION})")
+                pickle.load(f) # source stamp, only needed to decide whether the cache is current
                 cache_data = pickle.load(f)
             self.symbols = cache_data['symbols']
             self.functions = cache_data['functions']
@@ -186,6 +301,8 @@ class SymbolParser:
                 'has_call_kind': self.has_call_kind
             }
             with open(cache_path, 'wb') as f:
+                pickle.dump(CACHE_FORMAT_VERSION, f)
+                pickle.dump(self._source_stamp(), f)
                 pickle.dump(cache_data, f)
             logger.info("Successfully saved symbols to cache.")
         except Exception as e:
@@ -239,17 +356,30 @@ class SymbolParser:
         return subset_parser
 
     def _parse_yaml_file(self):
-        """Phase 1: Reads and sanitizes a YAML file, then loads the data."""
+        """Phase 1: Streams a YAML file through the sanitizer and loads the data."""
         logger.info(f"Reading and sanitizing index file: {self.index_file_path}")
-        # Read file and sanitize content into an in-memory string
+        # Let the loader pull sanitized bytes from the file incrementally, so neither
+        # the whole file content nor the whole list of documents is held in memory.
+        # libyaml decodes the UTF-8 itself, so no Python str of the content is built.
+        try:
+            with open(self.index_file_path, 'rb') as f:
+                self._load_documents(_YamlLoader(_TabSanitizingStream(f)).load_documents())
+            return
+        except yaml.reader.ReaderError as e:
+            logger.warning(f"Index file is not valid UTF-8 ({e}). Re-reading it with undecodable bytes dropped.")
+        self.symbols.clear()
+        self.unlinked_refs.clear()
+        self.has_container_field = self.has_call_kind = False
+        self._num_dropped_refs = 0
         with open(self.index_file_path, 'r', errors='ignore') as f:
-            yaml_content = f.read().replace('\t', '  ')
-        
-        self._load_from_string(yaml_content)
+            self._load_documents(_YamlLoader(_TabSanitizingStream(f)).load_documents())
 
-    def _load_from_string(self, yaml_content: str):
-        """Loads symbols and unlinked refs from a YAML content string."""
-        documents = list(yaml.safe_load_all(yaml_content))
+    def _load_from_string(self, yaml_content: Union[str, bytes]):
+        """Loads symbols and unlinked refs from YAML content (a string or UTF-8 bytes)."""
+        self._load_documents(_YamlLoader(yaml_content).load_documents())
+
+    def _load_documents(self, documents):
+        """Consumes an iterable of YAML documents one at a time."""
         for doc in documents:
             if not doc:
                 continue
@@ -257,37 +387,78 @@ class SymbolParser:
                 symbol = self._parse_symbol_doc(doc)
                 self.symbols[symbol.id] = symbol
             elif 'ID' in doc and 'References' in doc:
-                self.unlinked_refs.append(doc)
+                self._buffer_ref_doc(doc['ID'], doc['References'])
+
+    def _buffer_ref_doc(self, symbol_id: str, ref_list: List[Dict]):
+        """
+        Keeps the references of a !Refs document that may be linked later, and updates
+        the index feature flags from them. Only references inside a container or with a
+        call kind can ever be kept by build_cross_references(), so the rest are dropped
+        here, before the document is retained until linking.
+        """
+        if not self.has_container_field:
+            self._detect_index_features(ref_list)
+        usable_refs = [ref_data for ref_data in ref_list
+                       if 'Location' in ref_data and 'Kind' in ref_data
+                       and ((container_id := ref_data.get('Container', {}).get('ID')) and container_id != NULL_CONTAINER_ID
+                            or ref_data['Kind'] in ALL_CALL_REF_KINDS)]
+        self._num_dropped_refs += len(ref_list) - len(usable_refs)
+        if usable_refs:
+            self.unlinked_refs.append((symbol_id, usable_refs))
 
     def build_cross_references(self):
         """Phase 2: Links loaded references and builds the functions table."""
         logger.info("Building cross-references and populating functions table...")
-        
-        for ref_doc in self.unlinked_refs:
-            symbol_id = ref_doc['ID']
-            if symbol_id not in self.symbols:
-                continue
-            
-            for ref_data in ref_doc['References']:
-                if 'Location' in ref_data and 'Kind' in ref_data:
-                    reference = Reference.from_dict(ref_data)
-                    self.symbols[symbol_id].references.append(reference)
-
-                    if not self.has_container_field and reference.container_id:
-                        self.has_container_field = True
-                        self.has_call_kind = True
 
-                    elif not self.has_call_kind and reference.kind >= 16:
-                        self.has_call_kind = True
+        # Only keep the references some consumer can use, so no Reference object is built
+        # for the rest. With the Container field, both the call graph extractor and
+        # create_sufficient_subset() only look at references inside a container. Without
+        # it, only call sites of functions are ever used. References without a location or
+        # kind were already dropped while loading.
+        valid_call_kinds = CALL_REF_KINDS if self.has_call_kind else LEGACY_CALL_REF_KINDS
+        location_pool = self._location_pool
+        num_kept = 0
+        num_dropped = self._num_dropped_refs
+        for symbol_id, ref_list in self.unlinked_refs:
+            symbol = self.symbols.get(symbol_id)
+            if symbol is None:
+                continue
+            if self.has_container_field:
+                kept_refs = [Reference.from_dict(ref_data, location_pool) for ref_data in ref_list
+                             if (container_id := ref_data.get('Container', {}).get('ID'))
+                             and container_id != NULL_CONTAINER_ID]
+            elif symbol.is_function():
+                kept_refs = [Reference.from_dict(ref_data, location_pool) for ref_data in ref_list
+                             if ref_data['Kind'] in valid_call_kinds]
+            else:
+                kept_refs = ()
+            symbol.references.extend(kept_refs)
+            num_kept += len(kept_refs)
+            num_dropped += len(ref_list) - len(kept_refs)
+        logger.info(f"Kept {num_kept} references, dropped {num_dropped} that are neither call sites nor inside a container.")
 
         for symbol in self.symbols.values():
             if symbol.is_function():
                 self.functions[symbol.id] = symbol
 
+        # Both are freed by reference counting: the raw YAML documents hold no cycles.
+        # The shared Location objects stay referenced by the symbols; only the pool goes.
         del self.unlinked_refs
-        gc.collect()
+        self._location_pool = {}
         logger.info(f"Cross-referencing complete. Found {len(self.symbols)} symbols and {len(self.functions)} functions.")
 
+    def _detect_index_features(self, ref_list: List[Dict]):
+        """Sets has_container_field and has_call_kind from the raw references of one document."""
+        for ref_data in ref_list:
+            if 'Location' not in ref_data or 'Kind' not in ref_data:
+                continue
+            if ref_data.get('Container', {}).get('ID'):
+                self.has_container_field = True
+                self.has_call_kind = True
+                return
+            if ref_data['Kind'] >= 16:
+                self.has_call_kind = True
+
     def _parse_symbol_doc(self, doc: dict) -> Symbol:
         """Parses a YAML document into a Symbol object."""
         sym_info = doc.get('SymInfo', {})
@@ -295,8 +466,8 @@ class SymbolParser:
             id=doc['ID'],
             name=doc['Name'],
             kind=sym_info.get('Kind', ''),
-            declaration=Location.from_dict(doc['CanonicalDeclaration']) if 'CanonicalDeclaration' in doc else None,
-            definition=Location.from_dict(doc['Definition']) if 'Definition' in doc else None,
+            declaration=Location.from_dict(doc['CanonicalDeclaration'], self._location_pool) if 'CanonicalDeclaration' in doc else None,
+            definition=Location.from_dict(doc['Definition'], self._location_pool) if 'Definition' in doc else None,
             references=[],
             scope=doc.get('Scope', ''),
             language=sym_info.get('Lang', ''),
@@ -307,86 +478,86 @@ class SymbolParser:
 
     # Reads and parses a clangd YAML index in parallel by chunking it in memory.
 
-    def _sanitize_and_chunk_in_memory(self, num_chunks: int) -> List[str]:
-        """Reads the source file once, returning a list of sanitized in-memory chunk strings."""
+    def _find_chunk_ranges(self, num_chunks: int) -> List[Tuple[int, int]]:
+        """
+        Splits the index file into up to num_chunks byte ranges of roughly equal size,
+        each starting at a document marker, so every worker can read its own range.
+        """
         if num_chunks <= 0:
             raise ValueError("Number of chunks must be positive.")
 
-        logger.info(f"Reading and chunking '{self.index_file_path}' into {num_chunks} in-memory chunks...")
-        
-        # First, count the documents to determine chunk size
-        total_docs = 0
-        with open(self.index_file_path, 'r', errors='ignore') as f:
-            for line in f:
-                if line.startswith('---'):
-                    total_docs += 1
-        
-        if total_docs == 0:
-            docs_per_chunk = 0
-        else:
-            docs_per_chunk = math.ceil(total_docs / num_chunks)
-
-        if docs_per_chunk == 0:
-            logger.warning("No YAML documents found. Proceeding with a single chunk.")
-            with open(self.index_file_path, 'r', errors='ignore') as f:
-                return [f.read().replace('\t', '  ')]
-
-        # Now, read the file again and create the in-memory chunks
-        chunks = []
-        current_chunk_lines = []
-        doc_count_in_chunk = 0
-        with open(self.index_file_path, 'r', errors='ignore') as f_in:
-            for line in f_in:
-                sanitized_line = line.replace('\t', '  ')
-                if sanitized_line.startswith('---'):
-                    if doc_count_in_chunk >= docs_per_chunk and len(chunks) < num_chunks -1:
-                        chunks.append("".join(current_chunk_lines))
-                        current_chunk_lines = []
-                        doc_count_in_chunk = 0
-                    doc_count_in_chunk += 1
-                current_chunk_lines.append(sanitized_line)
-        
-        if current_chunk_lines:
-            chunks.append("".join(current_chunk_lines))
-
-        logger.info(f"Successfully created {len(chunks)} in-memory chunks.")
-        return chunks
+        file_size = os.path.getsize(self.index_file_path)
+        if file_size == 0:
+            return [(0, 0)]
+
+        # Memory-map the file and search for the next '---' line after each even split
+        # point, so the main process never reads the whole file.
+        boundaries = [0]
+        with open(self.index_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for k in range(1, num_chunks):
+                pos = mm.find(b"\n---", max(k * file_size // num_chunks, boundaries[-1]))
+                if pos < 0:
+                    break
+                boundaries.append(pos + 1)
+        boundaries.append(file_size)
+
+        chunk_ranges = list(zip(boundaries, boundaries[1:]))
+        logger.info(f"Split '{self.index_file_path}' into {len(chunk_ranges)} chunks at document boundaries.")
+        return chunk_ranges
 
     def _parallel_parse(self, num_workers: int):
         """
         Phase 1 (Parallel): Reads and loads raw data from the index file in parallel.
         """
-        logger.info("Sanitizing and chunking YAML file for parallel processing...")
-        # Create in-memory chunks from the main file
-        content_chunks = self._sanitize_and_chunk_in_memory(num_workers)
+        chunk_ranges = self._find_chunk_ranges(num_workers)
 
-        logger.info(f"Starting parallel parsing of {len(content_chunks)} chunks with {num_workers} workers...")
+        logger.info(f"Starting parallel parsing with {num_workers} workers...")
         with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
-            results = executor.map(_parse_worker, content_chunks, itertools.repeat(self.log_batch_size))
+            # Only the file path and byte offsets are sent to the workers; each one reads
+            # and sanitizes its own range of the file.
+            results = executor.map(_parse_worker, itertools.repeat(self.index_file_path),
+                                   *zip(*chunk_ranges), itertools.repeat(self.log_batch_size))
             
-            for i, (symbols_chunk, refs_chunk) in enumerate(results):
-                logger.info(f"Merging results from chunk {i+1}/{len(content_chunks)}...")
+            for i, (symbols_chunk, refs_chunk, features, num_dropped_refs) in enumerate(results):
+                logger.info(f"Merging results from chunk {i+1}...")
                 self.symbols.update(symbols_chunk)
                 self.unlinked_refs.extend(refs_chunk)
+                has_container_field, has_call_kind = features
+                self.has_container_field |= has_container_field
+                self.has_call_kind |= has_call_kind
+                self._num_dropped_refs += num_dropped_refs
         
         logger.info("All chunks processed and merged.")
 
 # --- Parallel Parser ---
 
-def _parse_worker(yaml_content_chunk: str, log_batch_size: int) -> Tuple[Dict[str, Symbol], List[Dict], bool]:
+@gc_paused()
+def _parse_worker(index_file_path: str, start: int, end: int, log_batch_size: int) -> Tuple[Dict[str, Symbol], List[Tuple[str, List[Dict]]], Tuple[bool, bool], int]:
     """
-    Worker function to parse a YAML content string chunk.
+    Worker function to parse the [start, end) byte range of the index file.
     This function is executed in a separate process.
     """
+    # The chunk stays bytes: libyaml decodes UTF-8 itself, whereas a str would be
+    # decoded here and then encoded back to UTF-8 by the loader.
+    with open(index_file_path, 'rb') as f:
+        f.seek(start)
+        yaml_content_chunk = f.read(end - start).replace(b'\t', b'  ')
+
     # new a local parser since the forked process can only see module-level symbols
     # we only need to use its functions, so no need to pass the index_file_path
     local_parser = SymbolParser("", log_batch_size)
     try:
-        local_parser._load_from_string(yaml_content_chunk)
-        return local_parser.symbols, local_parser.unlinked_refs
+        try:
+            local_parser._load_from_string(yaml_content_chunk)
+        except yaml.reader.ReaderError as e:
+            logger.warning(f"Chunk is not valid UTF-8 ({e}). Re-reading it with undecodable bytes dropped.")
+            local_parser = SymbolParser("", log_batch_size)
+            local_parser._load_from_string(yaml_content_chunk.decode('utf-8', errors='ignore'))
+        return (local_parser.symbols, local_parser.unlinked_refs,
+                (local_parser.has_container_field, local_parser.has_call_kind), local_parser._num_dropped_refs)
 
     except yaml.YAMLError as e:
         logger.error(f"YAML parsing error in worker: {e}")
-        return {}, [], False
+        return {}, [], (False, False), 0
 
 
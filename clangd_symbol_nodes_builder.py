@@ -12,7 +12,6 @@ from urllib.parse import urlparse, unquote
 from typing import List, Dict, Any, Tuple, Optional
 from collections import defaultdict
 import logging
-import gc
 from tqdm import tqdm
 
 import input_params
@@ -27,6 +26,8 @@ class PathManager:
     """Manages file paths and their relationships within the project."""
     def __init__(self, project_path: str) -> None:
         self.project_path = str(Path(project_path).resolve())
+        # Every symbol of a file carries the same URI, so each URI is resolved only once.
+        self._project_relative_paths: Dict[str, Optional[str]] = {}
         
     def uri_to_relative_path(self, uri: str) -> str:
         parsed = urlparse(uri)
@@ -37,6 +38,22 @@ class PathManager:
         except ValueError:
             return path
 
+    def project_relative_path(self, uri: str) -> Optional[str]:
+        """Returns the project-relative path of a file URI, or None if it is not a file inside the project."""
+        try:
+            return self._project_relative_paths[uri]
+        except KeyError:
+            pass
+        relative_path = None
+        parsed = urlparse(uri)
+        if parsed.scheme == 'file':
+            try:
+                relative_path = str(Path(unquote(parsed.path)).relative_to(self.project_path))
+            except ValueError:
+                pass
+        self._project_relative_paths[uri] = relative_path
+        return relative_path
+
     def is_within_project(self, path: str) -> bool:
         try:
             Path(path).relative_to(self.project_path)
@@ -68,9 +85,9 @@ class SymbolProcessor:
         # Set primary display location for all symbols, not just functions
         primary_location = sym.definition or sym.declaration
         if primary_location:
-            abs_file_path = unquote(urlparse(primary_location.file_uri).path)
-            if self.path_manager.is_within_project(abs_file_path):
-                symbol_data["path"] = self.path_manager.uri_to_relative_path(primary_location.file_uri)
+            relative_path = self.path_manager.project_relative_path(primary_location.file_uri)
+            if relative_path is not None:
+                symbol_data["path"] = relative_path
             else:
                 # For out-of-project symbol, skip it.
                 return None
@@ -96,9 +113,9 @@ class SymbolProcessor:
             
         # Set file_path for creating DEFINES relationships (in-project only)
         if sym.definition:
-            abs_file_path = unquote(urlparse(sym.definition.file_uri).path)
-            if self.path_manager.is_within_project(abs_file_path):
-                symbol_data["file_path"] = self.path_manager.uri_to_relative_path(sym.definition.file_uri)
+            relative_path = self.path_manager.project_relative_path(sym.definition.file_uri)
+            if relative_path is not None:
+                symbol_data["file_path"] = relative_path
         
         return symbol_data
 
@@ -119,7 +136,6 @@ class SymbolProcessor:
         defines_data_structure_list = [d for d in data_structure_data_list if 'file_path' in d]
 
         del symbol_data_list
-        gc.collect()
 
         return function_data_list, data_structure_data_list, defines_function_list, defines_data_structure_list
 
@@ -143,7 +159,6 @@ class SymbolProcessor:
             self._ingest_defines_relationships_batched_parallel(defines_function_list, defines_data_structure_list, neo4j_mgr)
 
         del function_data_list, data_structure_data_list, defines_function_list, defines_data_structure_list
-        gc.collect()
 
     def _ingest_function_nodes(self, function_data_list: List[Dict], neo4j_mgr: Neo4jManager):
         if not function_data_list:
@@ -391,10 +406,9 @@ class PathProcessor:
         logger.info("Discovering file paths from symbols...")
         for sym in tqdm(symbols.values(), desc="Discovering paths from symbols"):
             for loc in [sym.definition, sym.declaration]:
-                if loc and urlparse(loc.file_uri).scheme == 'file':
-                    abs_path = unquote(urlparse(loc.file_uri).path)
-                    if self.path_manager.is_within_project(abs_path):
-                        relative_path = self.path_manager.uri_to_relative_path(loc.file_uri)
+                if loc:
+                    relative_path = self.path_manager.project_relative_path(loc.file_uri)
+                    if relative_path is not None:
                         project_files.add(relative_path)
         logger.info(f"Discovered {len(project_files)} unique files from symbols.")
         return project_files
@@ -454,7 +468,6 @@ class PathProcessor:
         
         self._ingest_folder_nodes_and_relationships(folder_data_list)
         del folder_data_list
-        gc.collect()
 
         file_data_list = []
         for file_path in project_files:
@@ -477,7 +490,6 @@ class PathProcessor:
         self._ingest_file_nodes_and_relationships(file_data_list)
         del file_data_list
         del project_files, project_folders, sorted_folders
-        gc.collect()
 
     def _ingest_folder_nodes_and_relationships(self, folder_data_list: List[Dict]):
         if not folder_data_list:
@@ -621,7 +633,6 @@ def main():
         path_processor = PathProcessor(path_manager, neo4j_mgr, args.log_batch_size, args.ingest_batch_size)
         path_processor.ingest_paths(symbol_parser.symbols)
         del path_processor
-        gc.collect()
         logger.info("--- Finished Phase 1 ---")
 
         logger.info("\n--- Starting Phase 2: Ingesting Symbol Definitions ---")
@@ -634,7 +645,6 @@ def main():
         symbol_processor.ingest_symbols_and_relationships(symbol_parser.symbols, neo4j_mgr, args.defines_generation)
         
         del symbol_processor
-        gc.collect()
         
         logger.info(f"\n✅ Done. Processed {len(symbol_parser.symbols)} symbols.")
         return 0
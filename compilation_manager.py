@@ -7,7 +7,6 @@ treesitter), and handling the caching of parsing results.
 
 import os
 import logging
-import gc
 import pickle
 from typing import Optional, List, Tuple, Dict, Set
 
@@ -25,7 +24,12 @@ logger = logging.getLogger(__name__)
 # --- Caching Logic ---
 
 class ParserCache:
-    """Handles caching of extracted data (function spans and include relations)."""
+    """
+    Handles caching of extracted data (function spans and include relations).
+
+    The cache file holds two pickles: a small header with the validity metadata,
+    followed by the extracted data, so checking validity never unpickles the spans.
+    """
     def __init__(self, folder: str, cache_path_spec: Optional[str] = None):
         self.folder = folder
         self.repo = get_git_repo(folder)
@@ -60,6 +64,8 @@ class ParserCache:
             with open(self.cache_path, "rb") as f: cached_data = pickle.load(f)
         except (pickle.UnpicklingError, EOFError):
             logger.warning("Cache file %s is corrupted. Ignoring.", self.cache_path); return False
+        if "function_spans" in cached_data:
+            logger.info("Parser cache %s was written in an older format. Ignoring.", self.cache_path); return False
         
         if self.repo and not self.repo.is_dirty():
             if cached_data.get("type") == "git" and cached_data.get("commit_hash") == self.repo.head.object.hexsha:
@@ -76,22 +82,26 @@ class ParserCache:
         """Loads extracted data (function spans, include relations) from the cache."""
         logger.info(f"Loading extracted data from cache: {self.cache_path}")
         with open(self.cache_path, "rb") as f: 
+            pickle.load(f)  # Header, already checked by is_valid()
             loaded_data = pickle.load(f)
             return loaded_data.get("function_spans", []), loaded_data.get("include_relations", set())
 
     def save(self, function_spans: List[Dict], include_relations: Set[Tuple[str, str]]):
         """Saves extracted data to the cache."""
         logger.info(f"Saving new extracted data to cache: {self.cache_path}")
+        cache_header = {}
+        if self.repo: 
+            cache_header["type"] = "git"
+            cache_header["commit_hash"] = self.repo.head.object.hexsha
+        else: 
+            cache_header["type"] = "mtime"
         cache_obj = {
             "function_spans": function_spans,
             "include_relations": include_relations
         }
-        if self.repo: 
-            cache_obj["type"] = "git"
-            cache_obj["commit_hash"] = self.repo.head.object.hexsha
-        else: 
-            cache_obj["type"] = "mtime"
-        with open(self.cache_path, "wb") as f: pickle.dump(cache_obj, f)
+        with open(self.cache_path, "wb") as f:
+            pickle.dump(cache_header, f)
+            pickle.dump(cache_obj, f)
 
 # --- Main Manager Class ---
 
@@ -138,7 +148,6 @@ class CompilationManager:
         parser.parse(source_files, num_workers)
         logger.info(f"Finished parsing {len(source_files)} source files.")
         cache.save(parser.get_function_spans(), parser.get_include_relations())
-        gc.collect()
         return
 
     def parse_files(self, file_list: List[str], num_workers: int = 1):
@@ -146,7 +155,6 @@ class CompilationManager:
         logger.info(f"Parsing {len(file_list)} specific files (no cache)...")
         parser = self._create_parser()
         parser.parse(file_list, num_workers)
-        gc.collect()
         return
 
     def get_function_spans(self) -> List[Dict]:
@@ -163,6 +171,11 @@ if __name__ == "__main__":
     import argparse
     import sys
     import yaml
+    # The libyaml emitter is much faster than the pure-Python one for large span dumps.
+    try:
+        from yaml import CSafeDumper as YamlDumper
+    except ImportError:
+        from yaml import SafeDumper as YamlDumper
     from pathlib import Path
     from collections import defaultdict
     import input_params
@@ -264,12 +277,10 @@ if __name__ == "__main__":
             'grouped_include_relations': dict(sorted(grouped_includes.items()))
         }
 
-    yaml_output = yaml.dump(results, sort_keys=False, allow_unicode=True)
-
     if args.output:
         output_path = str(args.output.resolve())
         with open(output_path, "w", encoding="utf-8") as out:
-            out.write(yaml_output)
+            yaml.dump(results, out, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
         print(f"Output saved to {output_path}")
     else:
-        print(yaml_output)
+        print(yaml.dump(results, Dumper=YamlDumper, sort_keys=False, allow_unicode=True))
@@ -15,7 +15,6 @@ from pathlib import Path
 from collections import defaultdict
 from tqdm import tqdm
 from concurrent.futures import ProcessPoolExecutor, as_completed
-import gc
 
 # Optional imports for concrete implementations
 try:
@@ -231,7 +230,6 @@ class CompilationParser:
 
         self.function_spans = all_spans
         self.include_relations = all_includes
-        gc.collect()
 
 # --- Concrete Implementations ---
 
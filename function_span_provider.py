@@ -8,13 +8,14 @@ enrich the in-memory Symbol objects with `body_location` data.
 """
 
 import logging
-import os, gc
-from typing import List, Optional
+import os
+from typing import Dict, List, Optional
 
 from urllib.parse import urlparse, unquote
 
-from clangd_index_yaml_parser import SymbolParser, FunctionSpan
+from clangd_index_yaml_parser import SymbolParser, RelativeLocation
 from compilation_manager import CompilationManager
+from memory_debugger import gc_paused
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,7 @@ class FunctionSpanProvider:
         self.compilation_manager = compilation_manager
         self.matched_symbols_count = 0
 
+    @gc_paused()
     def enrich_symbols_with_span(self):
         """
         Performs the main enrichment process. It gets function span data from the
@@ -44,8 +46,12 @@ class FunctionSpanProvider:
 
         function_span_file_dicts = self.compilation_manager.get_function_spans()
         
-        # 1. Process raw span dictionaries into a lookup table
-        spans_lookup = {}
+        # 1. Index the raw span dictionaries per file by packed name position.
+        #    Keying per file keeps the long file URI out of every per-function key, and
+        #    the FunctionSpan data is only converted for spans that actually match.
+        #    Only one name can start at a given source position, so the name is checked
+        #    on a hit instead of being hashed into every key.
+        spans_lookup: Dict[str, Dict[int, dict]] = {}
         num_functions = sum(len(d.get('Functions', [])) for d in function_span_file_dicts)
         logger.info(f"Processing {num_functions} function definitions from {len(function_span_file_dicts)} files for enrichment.")
 
@@ -54,23 +60,24 @@ class FunctionSpanProvider:
             if not file_uri or 'Functions' not in file_dict:
                 continue
             
+            file_spans = spans_lookup.setdefault(file_uri, {})
             for func_data in file_dict['Functions']:
                 if not func_data: continue
-                span = FunctionSpan.from_dict(func_data)
-                key = (span.name, file_uri, 
-                       span.name_location.start_line, span.name_location.start_column)
-                spans_lookup[key] = span
+                name_start = func_data['NameLocation']['Start']
+                file_spans[(name_start['Line'] << 32) | name_start['Column']] = func_data
         
         # 2. Match symbols against the lookup table and enrich
         matched_count = 0
         for func_symbol in self.symbol_parser.functions.values():
-            if func_symbol.definition:
-                key = (func_symbol.name, func_symbol.definition.file_uri,
-                       func_symbol.definition.start_line, func_symbol.definition.start_column)
-                
-                if key in spans_lookup:
+            definition = func_symbol.definition
+            if definition:
+                file_spans = spans_lookup.get(definition.file_uri)
+                if not file_spans:
+                    continue
+                func_data = file_spans.get((definition.start_line << 32) | definition.start_column)
+                if func_data is not None and func_data['Name'] == func_symbol.name:
                     # Enrich the Symbol object directly in-place
-                    func_symbol.body_location = spans_lookup[key].body_location
+                    func_symbol.body_location = RelativeLocation.from_dict(func_data['BodyLocation'])
                     matched_count += 1
         
         self.matched_symbols_count = matched_count
@@ -79,7 +86,6 @@ class FunctionSpanProvider:
         # 3. Clean up references to free memory
         self.symbol_parser = None
         del function_span_file_dicts, spans_lookup
-        gc.collect()
 
     def get_matched_count(self) -> int:
         """Returns the number of symbols that were successfully enriched."""
@@ -14,6 +14,14 @@ NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "12345678")
 
+# Labels and property keys cannot be query parameters, so they are backtick-quoted,
+# with any backtick inside the name doubled.
+_CYPHER_IDENTIFIER_ESCAPE = str.maketrans({"`": "``"})
+
+def quote_cypher_identifier(name: str) -> str:
+    """Returns name as a backtick-quoted Cypher identifier."""
+    return f"`{name.translate(_CYPHER_IDENTIFIER_ESCAPE)}`"
+
 class Neo4jManager:
     """Manages Neo4j database operations."""
     def __init__(self, uri: str = NEO4J_URI, user: str = NEO4J_USER, password: str = NEO4J_PASSWORD) -> None:
@@ -297,10 +305,11 @@ class Neo4jManager:
         if label and all_labels:
             raise ValueError("Cannot specify both 'label' and 'all_labels'. Choose one.")
 
-        target_clause = f"n:{label}" if label else "n"
+        target_clause = f"n:{quote_cypher_identifier(label)}" if label else "n"
         logger.info(f"Deleting property '{property_key}' from nodes matching '{target_clause}'...")
         
-        query = f"MATCH ({target_clause}) WHERE n.{property_key} IS NOT NULL REMOVE n.{property_key} RETURN count(n)"
+        quoted_key = quote_cypher_identifier(property_key)
+        query = f"MATCH ({target_clause}) WHERE n.{quoted_key} IS NOT NULL REMOVE n.{quoted_key} RETURN count(n)"
         
         with self.driver.session() as session:
             result = session.run(query)
@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+
+from run_cyper_file import read_queries_from_file
+
+
+def _read(tmp_path, text):
+    path = tmp_path / "queries.cql"
+    path.write_text(text, encoding="utf-8")
+    return read_queries_from_file(str(path))
+
+
+def test_apostrophe_in_inline_comment_does_not_open_a_quote(tmp_path):
+    queries = _read(tmp_path, (
+        "MATCH (n) RETURN n; // don't run twice\n"
+        "MATCH (m) RETURN m;\n"
+        "MATCH (k) RETURN k;\n"
+    ))
+    assert queries == ["MATCH (n) RETURN n", "MATCH (m) RETURN m", "MATCH (k) RETURN k"]
+
+
+def test_comment_markers_and_semicolons_inside_strings_are_kept(tmp_path):
+    queries = _read(tmp_path, (
+        "CREATE (n {url: 'http://x;y'});\n"
+        "// full-line comment; ignored\n"
+        "MATCH (n) RETURN n\n"
+    ))
+    assert queries == ["CREATE (n {url: 'http://x;y'})", "MATCH (n) RETURN n"]
@@ -9,8 +9,12 @@ from tree_sitter import Language, Parser
 import argparse
 import sys, logging, re
 import os
+import functools
 from pathlib import Path
 
+# Compiled once; write_ast collapses whitespace in every AST node it visits.
+_WHITESPACE_RE = re.compile(r'\s+')
+
 class ASTToDot:
     def __init__(self):
         self.node_counter = 0
@@ -22,8 +26,10 @@ class ASTToDot:
         self.node_counter += 1
         return f"node_{self.node_counter}"
     
-    def escape_label(self, text):
-        """Escape special characters for DOT labels"""
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def escape_label(text):
+        """Escape special characters for DOT labels (memoized: node types and tokens repeat a lot)"""
         # First, escape backslashes
         text = text.replace('\\', '\\\\')
         # Then escape quotes
@@ -160,8 +166,7 @@ def generate_image(dot_file, output_format="png"):
 
 def write_ast(node, f, indent):
     node_text = node.text.decode('utf-8') if node.text else ''
-    node_text = node_text.replace('\n', " ")
-    node_text = re.sub(r'\s+', ' ', node_text)
+    node_text = _WHITESPACE_RE.sub(' ', node_text)
     if len(node_text) > 35:
         node_text = node_text[:15] + " ... " + node_text[-15:]
 
@@ -2,6 +2,10 @@
 import os, tempfile, shutil
 import sys
 import yaml
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
 import argparse
 import clang.cindex
 
@@ -215,7 +219,7 @@ class ClangSpanExtractor:
     def get_spans(self, files=None, format='yaml', output=None):
         data = self.extract_spans(files)
         if format == 'yaml':
-            yaml_content = yaml.dump(data, sort_keys=False, allow_unicode=True)
+            yaml_content = yaml.dump(data, Dumper=YamlDumper, sort_keys=False, allow_unicode=True)
             if output:
                 with open(output, 'w', encoding='utf-8') as f:
                     f.write(yaml_content)
@@ -5,6 +5,10 @@ import sys
 from neo4j import GraphDatabase
 
 
+# Cypher string literals use ' or ", and identifiers may be quoted with `.
+QUOTE_CHARS = ("'", '"', "`")
+
+
 class Neo4jManager:
     """Manages Neo4j database operations."""
 
@@ -64,25 +68,58 @@ class Neo4jManager:
 
 
 def read_queries_from_file(filepath: str) -> list[str]:
-    """Read Cypher queries from file, separated by ';' or newlines."""
+    """Read Cypher queries from file, separated by ';' or newlines.
+
+    A ';' inside a quoted string or identifier does not end a query, and an inline
+    '//' comment outside quotes is dropped. The pieces of each query are collected
+    in a list and joined once, instead of growing a string.
+    """
     queries = []
-    buffer = ""
+    pieces = []
+    quote = None  # The quote character of the string literal we are inside, if any
+
+    def flush():
+        query = " ".join(pieces).strip()
+        pieces.clear()
+        if query:
+            queries.append(query)
+
     with open(filepath, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
-            if not line or line.startswith("//"):
+            if not line or (quote is None and line.startswith("//")):
                 continue
 
-            buffer += " " + line
-
-            while ";" in buffer:
-                part, buffer = buffer.split(";", 1)
-                if part.strip():
-                    queries.append(part.strip())
-
-    if buffer.strip():
-        queries.append(buffer.strip())
+            # Fast path: no quotes or inline comment to track on this line.
+            if quote is None and "//" not in line and not any(q in line for q in QUOTE_CHARS):
+                *complete, rest = line.split(";")
+                for part in complete:
+                    pieces.append(part)
+                    flush()
+                pieces.append(rest)
+                continue
 
+            start = 0
+            i = 0
+            while i < len(line):
+                ch = line[i]
+                if quote is not None:
+                    if ch == "\\":
+                        i += 1  # Skip the escaped character
+                    elif ch == quote:
+                        quote = None
+                elif ch in QUOTE_CHARS:
+                    quote = ch
+                elif line.startswith("//", i):
+                    break  # The rest of the line is a comment
+                elif ch == ";":
+                    pieces.append(line[start:i])
+                    flush()
+                    start = i + 1
+                i += 1
+            pieces.append(line[start:i])
+
+    flush()
     return queries
 
 